@@ -1,25 +1,63 @@
+import string
+
 from django.contrib import admin
-from .models import License, LicenseActivation
+from django.utils import timezone
+from .fields import hex_prefix_range
+from .models import License, LicenseActivation, ArchivedLicenseActivation
+
+
+class MachineIdSearchMixin:
+    """
+    Match machine_id by hex prefix, since binary columns can't be searched with icontains.
+
+    The prefix becomes a byte range, so the shortened ID shown in the list
+    (with or without its trailing "...") finds the full row.
+    """
+    
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        prefix = search_term.strip().rstrip('.')
+        max_length = self.model._meta.get_field('machine_id').max_length
+        if prefix and len(prefix) <= max_length * 2 and all(char in string.hexdigits for char in prefix):
+            low, high = hex_prefix_range(prefix)
+            matches = queryset.filter(machine_id__gte=low)
+            if high is not None:
+                matches = matches.filter(machine_id__lt=high)
+            results |= matches
+        return results, may_have_duplicates
 
 
 class LicenseActivationInline(admin.TabularInline):
     """Inline display of activations on the License admin page."""
     model = LicenseActivation
     extra = 0
-    readonly_fields = ['machine_id', 'app_version', 'platform', 'activated_at', 'last_validated_at']
+    readonly_fields = ['machine_id', 'app_version', 'platform', 'activated_at', 'last_validated_at', 'deactivated_at']
     can_delete = False
     
     def has_add_permission(self, request, obj=None):
         return False
 
 
+class ArchivedLicenseActivationInline(admin.TabularInline):
+    """Inline display of archived activation history on the License admin page."""
+    model = ArchivedLicenseActivation
+    extra = 0
+    fields = ['machine_id', 'app_version', 'platform', 'activated_at', 'last_validated_at', 'deactivated_at', 'archived_at']
+    readonly_fields = fields
+    can_delete = False
+    verbose_name_plural = 'Archived activations'
+    
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(License)
 class LicenseAdmin(admin.ModelAdmin):
     list_display = ['key', 'email', 'is_revoked', 'active_activations_display', 'max_activations', 'expires_at', 'created_at']
     list_filter = ['is_revoked', 'created_at']
     search_fields = ['key', 'email', 'notes']
     readonly_fields = ['key', 'created_at']
-    inlines = [LicenseActivationInline]
+    inlines = [LicenseActivationInline, ArchivedLicenseActivationInline]
     
     fieldsets = (
         (None, {
@@ -56,13 +94,13 @@ class LicenseAdmin(admin.ModelAdmin):
 
 
 @admin.register(LicenseActivation)
-class LicenseActivationAdmin(admin.ModelAdmin):
+class LicenseActivationAdmin(MachineIdSearchMixin, admin.ModelAdmin):
     list_display = ['license', 'machine_id_short', 'platform', 'app_version', 'is_active', 'activated_at', 'last_validated_at']
     list_filter = ['is_active', 'platform', 'activated_at']
-    search_fields = ['license__key', 'license__email', 'machine_id']
-    readonly_fields = ['license', 'machine_id', 'app_version', 'platform', 'activated_at', 'last_validated_at']
+    search_fields = ['license__key', 'license__email']
+    readonly_fields = ['license', 'machine_id', 'app_version', 'platform', 'activated_at', 'last_validated_at', 'deactivated_at']
     
-    actions = ['deactivate_activations', 'reactivate_activations']
+    actions = ['deactivate_activations', 'reactivate_activations', 'archive_activations']
     
     @admin.display(description='Machine ID')
     def machine_id_short(self, obj):
@@ -70,10 +108,31 @@ class LicenseActivationAdmin(admin.ModelAdmin):
     
     @admin.action(description='Deactivate selected activations')
     def deactivate_activations(self, request, queryset):
-        count = queryset.update(is_active=False)
+        # update() skips auto_now, so record the deactivation time explicitly
+        count = queryset.filter(is_active=True).update(is_active=False, deactivated_at=timezone.now())
         self.message_user(request, f'{count} activation(s) deactivated.')
     
     @admin.action(description='Reactivate selected activations')
     def reactivate_activations(self, request, queryset):
-        count = queryset.update(is_active=True)
+        count = queryset.update(is_active=True, deactivated_at=None)
         self.message_user(request, f'{count} activation(s) reactivated.')
+    
+    @admin.action(description='Archive selected inactive activations')
+    def archive_activations(self, request, queryset):
+        count = queryset.archive()
+        self.message_user(request, f'{count} activation(s) archived.')
+
+
+@admin.register(ArchivedLicenseActivation)
+class ArchivedLicenseActivationAdmin(MachineIdSearchMixin, admin.ModelAdmin):
+    list_display = ['license', 'machine_id_short', 'platform', 'app_version', 'activated_at', 'archived_at']
+    list_filter = ['platform', 'archived_at']
+    search_fields = ['license__key', 'license__email']
+    readonly_fields = ['license', 'machine_id', 'app_version', 'platform', 'activated_at', 'last_validated_at', 'deactivated_at', 'archived_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    @admin.display(description='Machine ID')
+    def machine_id_short(self, obj):
+        return f"{obj.machine_id[:12]}..."
@@ -0,0 +1,69 @@
+import string
+
+from django.core.exceptions import ValidationError
+from django.db import models
+
+
+def is_hex_digest(value, max_bytes=None):
+    """Check if a string is an even-length hex digest of at most max_bytes."""
+    if not isinstance(value, str) or not value or len(value) % 2:
+        return False
+    if max_bytes is not None and len(value) > max_bytes * 2:
+        return False
+    return all(char in string.hexdigits for char in value)
+
+
+def hex_prefix_range(prefix):
+    """
+    Return the (low, high) byte bounds of values starting with a hex prefix.
+
+    Matching values satisfy low <= value < high; high is None when no upper
+    bound is needed (a prefix of all 'f's).
+    """
+    padding = len(prefix) % 2
+    low = bytes.fromhex(prefix + '0' * padding)
+    high = bytearray.fromhex(prefix + 'f' * padding)
+    while high and high[-1] == 0xff:
+        high.pop()
+    if not high:
+        return low, None
+    high[-1] += 1
+    return low, bytes(high)
+
+
+class HexBinaryField(models.BinaryField):
+    """
+    Stores a hex digest as raw bytes.
+
+    Python code and the API see a lowercase hex string, while the database
+    holds half as many bytes, keeping indexes that include it smaller.
+    max_length is the length in bytes, not hex characters.
+    """
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return bytes(value).hex()
+
+    def to_python(self, value):
+        if value is None:
+            return value
+        if isinstance(value, (bytes, memoryview)):
+            return bytes(value).hex()
+        if not is_hex_digest(value, self.max_length):
+            raise ValidationError(
+                'Enter a valid hex digest.', code='invalid', params={'value': value}
+            )
+        return value.lower()
+
+    def get_prep_value(self, value):
+        if value is None or isinstance(value, (bytes, memoryview)):
+            return value
+        return bytes.fromhex(self.to_python(value))
+
+    def run_validators(self, value):
+        # Length validators count bytes, not hex characters
+        super().run_validators(self.get_prep_value(value))
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
@@ -0,0 +1,88 @@
+"""
+Helpers for moving machine_id from hex text to binary storage.
+
+Used by migrations 0004 and 0005 and the clean_machine_ids command, so they
+work on historical models rather than importing licensing.models.
+"""
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+BATCH_SIZE = 1000
+
+# An even number of hex characters, at most 32 bytes (HexBinaryField max_length)
+HEX_MACHINE_ID_REGEX = r'^([0-9a-fA-F]{2}){1,32}$'
+
+MAX_REPORTED_PROBLEMS = 20
+
+
+def find_invalid_machine_ids(model, using):
+    """Rows whose machine_id is not hex or does not fit in 32 bytes."""
+    return model.objects.using(using).exclude(machine_id__regex=HEX_MACHINE_ID_REGEX)
+
+
+def find_case_duplicates(model, using):
+    """(license_id, lowercase machine_id, count) groups that collide once stored as bytes."""
+    return (
+        model.objects.using(using)
+        .order_by()
+        .annotate(machine_id_lower=Lower('machine_id'))
+        .values_list('license_id', 'machine_id_lower')
+        .annotate(count=Count('pk'))
+        .filter(count__gt=1)
+    )
+
+
+def find_machine_id_problems(apps, using):
+    """Describe every row that would stop the text-to-binary conversion."""
+    activation_model = apps.get_model('licensing', 'LicenseActivation')
+    archive_model = apps.get_model('licensing', 'ArchivedLicenseActivation')
+    problems = []
+    for model in (activation_model, archive_model):
+        for pk, machine_id in find_invalid_machine_ids(model, using).values_list('pk', 'machine_id'):
+            problems.append(f'{model.__name__} {pk}: invalid machine_id {machine_id!r}')
+    for license_id, machine_id, count in find_case_duplicates(activation_model, using):
+        problems.append(
+            f'LicenseActivation: license {license_id} has {count} rows for '
+            f'machine_id {machine_id!r} that differ only by case'
+        )
+    return problems
+
+
+def check_machine_ids(apps, using):
+    """Raise before any data is written if some rows can't be converted."""
+    problems = find_machine_id_problems(apps, using)
+    if problems:
+        shown = problems[:MAX_REPORTED_PROBLEMS]
+        if len(problems) > len(shown):
+            shown.append(f'... and {len(problems) - len(shown)} more')
+        raise ValueError(
+            'Some machine IDs cannot be converted to binary:\n  '
+            + '\n  '.join(shown)
+            + '\nRun `manage.py clean_machine_ids` to review them and '
+            '`manage.py clean_machine_ids --apply` to fix them, then migrate again.'
+        )
+
+
+def copy_machine_ids(model, using, source, target):
+    """
+    Fill the target column from the source for rows where it is still NULL.
+
+    Each batch commits on its own, and rows that were already copied are
+    skipped, so the copy can be re-run to catch up on rows written since.
+    """
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(
+                model.objects.using(using)
+                .filter(pk__gt=last_pk, **{f'{target}__isnull': True})
+                .order_by('pk')
+                .only('pk', source)[:BATCH_SIZE]
+            )
+            if not batch:
+                return
+            for row in batch:
+                setattr(row, target, getattr(row, source))
+            model.objects.using(using).bulk_update(batch, [target])
+        last_pk = batch[-1].pk
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from licensing.models import LicenseActivation
+
+
+class Command(BaseCommand):
+    help = "Move inactive license activations into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=0,
+            help="Only archive activations deactivated at least this many days ago",
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help="Number of rows moved per transaction",
+        )
+
+    def handle(self, *args, **options):
+        queryset = LicenseActivation.objects.filter(is_active=False)
+
+        if options['older_than_days']:
+            cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+            # Rows deactivated without a timestamp fall back to their last validation
+            queryset = queryset.filter(
+                Q(deactivated_at__lt=cutoff)
+                | Q(deactivated_at__isnull=True, last_validated_at__lt=cutoff)
+            )
+
+        count = queryset.archive(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{count} activation(s) archived.'))
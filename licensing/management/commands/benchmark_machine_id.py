@@ -0,0 +1,165 @@
+import json
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+ACTIVATION_TABLE = 'licensing_licenseactivation'
+LICENSE_TABLE = 'licensing_license'
+
+# Activations per generated license when populating a scratch database
+ACTIVATIONS_PER_LICENSE = 4
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the (license, machine_id) index and lookup latency on the real activation "
+        "table (PostgreSQL only). Uses raw SQL, so it runs before and after the binary "
+        "machine_id migrations. Run it with the same arguments on each side to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--populate',
+            type=int,
+            default=0,
+            metavar='ROWS',
+            help="First insert this many synthetic activations (scratch databases only)",
+        )
+        parser.add_argument(
+            '--lookups',
+            type=int,
+            default=100_000,
+            help="Number of existing (license, machine_id) pairs to look up",
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help="Number of timed runs over the lookup sample",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('This benchmark requires PostgreSQL.')
+
+        with connection.cursor() as cursor:
+            column_type = self.machine_id_type(cursor)
+            if options['populate']:
+                self.populate(cursor, options['populate'], column_type)
+            cursor.execute(f'VACUUM ANALYZE {ACTIVATION_TABLE}')
+
+            index = self.unique_index(cursor)
+            cursor.execute(
+                f'SELECT count(*), pg_relation_size(%s), pg_relation_size(%s), '
+                f'avg(pg_column_size(machine_id)) FROM {ACTIVATION_TABLE}',
+                [ACTIVATION_TABLE, index],
+            )
+            rows, table_size, index_size, column_width = cursor.fetchone()
+            if not rows:
+                raise CommandError('The activation table is empty. Use --populate on a scratch database.')
+
+            timings = self.time_lookups(cursor, index, rows, options['lookups'], options['repeat'])
+
+        self.stdout.write(f'machine_id type: {column_type}')
+        self.stdout.write(f'rows: {rows:,}')
+        self.stdout.write(f'avg machine_id size: {column_width:.1f} bytes')
+        self.stdout.write(f'table size: {table_size / 1024 / 1024:.1f} MiB')
+        self.stdout.write(f'unique index size: {index_size / 1024 / 1024:.1f} MiB')
+        self.stdout.write(
+            f'lookup latency (server-side, {options["lookups"]:,} lookups x {options["repeat"]}): '
+            f'min {min(timings):.3f} us, median {statistics.median(timings):.3f} us'
+        )
+
+    def machine_id_type(self, cursor):
+        cursor.execute(
+            'SELECT data_type FROM information_schema.columns '
+            'WHERE table_name = %s AND column_name = %s',
+            [ACTIVATION_TABLE, 'machine_id'],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise CommandError(f'{ACTIVATION_TABLE}.machine_id not found. Run migrate first.')
+        return row[0]
+
+    def unique_index(self, cursor):
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE tablename = %s "
+            "AND indexdef LIKE 'CREATE UNIQUE INDEX%%' AND indexdef LIKE '%%machine_id%%'",
+            [ACTIVATION_TABLE],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            raise CommandError('No unique index on (license_id, machine_id) found.')
+        return row[0]
+
+    def populate(self, cursor, rows, column_type):
+        """Insert synthetic licenses and activations with 32-char hex machine IDs."""
+        machine_id = "md5(g::text)" if column_type != 'bytea' else "decode(md5(g::text), 'hex')"
+        licenses = -(-rows // ACTIVATIONS_PER_LICENSE)
+        with transaction.atomic():
+            cursor.execute(f'SELECT coalesce(max(id), 0) FROM {LICENSE_TABLE}')
+            first_license = cursor.fetchone()[0] + 1
+            cursor.execute(
+                f'INSERT INTO {LICENSE_TABLE} '
+                f'(key, email, is_revoked, max_activations, created_at, notes) '
+                f"SELECT md5('license' || g::text)::uuid, 'bench' || g || '@example.com', "
+                f"false, {ACTIVATIONS_PER_LICENSE}, now(), '' FROM generate_series(1, %s) AS g",
+                [licenses],
+            )
+            cursor.execute(
+                f'INSERT INTO {ACTIVATION_TABLE} '
+                f'(license_id, machine_id, app_version, platform, activated_at, last_validated_at, is_active) '
+                f"SELECT %s + g %% %s, {machine_id}, '1.0.0', 'linux', now(), now(), true "
+                f'FROM generate_series(1, %s) AS g',
+                [first_license, licenses, rows],
+            )
+            # 0005 rebuilds the index, so start from a freshly built one here too
+            cursor.execute(f'REINDEX TABLE {ACTIVATION_TABLE}')
+
+    def time_lookups(self, cursor, index, rows, lookups, repeat):
+        """
+        Return the per-lookup execution time in microseconds for each run.
+
+        The sample is picked by id, so before and after the migration the same
+        rows are looked up. Joins are disabled so every probe is a nested-loop
+        index lookup, and EXPLAIN ANALYZE times it on the server without any
+        client round-trips.
+        """
+        step = max(1, rows // lookups)
+        timings = []
+        with transaction.atomic():
+            cursor.execute(
+                f'CREATE TEMP TABLE bench_sample ON COMMIT DROP AS '
+                f'SELECT license_id, machine_id FROM {ACTIVATION_TABLE} '
+                f'WHERE id %% %s = 0 ORDER BY id LIMIT %s',
+                [step, lookups],
+            )
+            cursor.execute('ANALYZE bench_sample')
+            for setting in ('enable_hashjoin', 'enable_mergejoin', 'enable_seqscan', 'enable_bitmapscan'):
+                cursor.execute(f'SET LOCAL {setting} = off')
+
+            query = (
+                f'SELECT count(*) FROM bench_sample s WHERE EXISTS ('
+                f'SELECT 1 FROM {ACTIVATION_TABLE} a '
+                f'WHERE a.license_id = s.license_id AND a.machine_id = s.machine_id)'
+            )
+            # Warm the cache so every run measures the same thing
+            cursor.execute(query)
+            found, sampled = cursor.fetchone()[0], self.count(cursor, 'bench_sample')
+            if found != sampled:
+                raise CommandError(f'Only {found} of {sampled} sampled rows were found.')
+
+            for _ in range(repeat):
+                cursor.execute(f'EXPLAIN (ANALYZE, TIMING OFF, FORMAT JSON) {query}')
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                if index not in json.dumps(plan):
+                    raise CommandError(f'Lookups did not use {index}.')
+                timings.append(plan[0]['Execution Time'] * 1000 / sampled)
+        return timings
+
+    def count(self, cursor, table):
+        cursor.execute(f'SELECT count(*) FROM {table}')
+        return cursor.fetchone()[0]
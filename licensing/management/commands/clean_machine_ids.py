@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.utils import timezone
+
+from licensing.machine_ids import (
+    find_case_duplicates,
+    find_invalid_machine_ids,
+    find_machine_id_problems,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Report machine IDs that block the binary machine_id migration. With --apply, "
+        "delete rows whose ID is not hex and archive all but one of each case-duplicate group."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--apply',
+            action='store_true',
+            help="Fix the rows instead of only listing them",
+        )
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help="Database to clean",
+        )
+
+    def handle(self, *args, **options):
+        using = options['database']
+        apps = self.historical_apps(using)
+
+        problems = find_machine_id_problems(apps, using)
+        if not problems:
+            self.stdout.write(self.style.SUCCESS('All machine IDs can be converted.'))
+            return
+        for problem in problems:
+            self.stdout.write(problem)
+        if not options['apply']:
+            self.stdout.write(f'{len(problems)} problem(s) found. Run again with --apply to fix them.')
+            return
+
+        activation_model = apps.get_model('licensing', 'LicenseActivation')
+        archive_model = apps.get_model('licensing', 'ArchivedLicenseActivation')
+        with transaction.atomic(using=using):
+            deleted = 0
+            for model in (activation_model, archive_model):
+                deleted += find_invalid_machine_ids(model, using).delete()[0]
+
+            archived = 0
+            for license_id, machine_id, count in list(find_case_duplicates(activation_model, using)):
+                # Keep the row the client is most likely still using
+                rows = list(
+                    activation_model.objects.using(using)
+                    .filter(license_id=license_id, machine_id__iexact=machine_id)
+                    .order_by('-is_active', '-last_validated_at', '-pk')
+                )
+                for row in rows[1:]:
+                    archive_model.objects.using(using).create(
+                        license_id=row.license_id,
+                        machine_id=row.machine_id.lower(),
+                        app_version=row.app_version,
+                        platform=row.platform,
+                        activated_at=row.activated_at,
+                        last_validated_at=row.last_validated_at,
+                        archived_at=timezone.now(),
+                    )
+                    row.delete()
+                    archived += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{deleted} invalid row(s) deleted, {archived} duplicate activation(s) archived.'
+        ))
+
+    def historical_apps(self, using):
+        """Models as of the applied licensing migrations, while machine_id is still text."""
+        executor = MigrationExecutor(connections[using])
+        applied = sorted(
+            name for app_label, name in executor.loader.applied_migrations
+            if app_label == 'licensing'
+        )
+        if '0005_swap_machine_id' in applied:
+            raise CommandError('Machine IDs are already stored as binary.')
+        if '0002_archivedlicenseactivation' not in applied:
+            raise CommandError('Run `manage.py migrate licensing 0002` first.')
+        return executor.loader.project_state(('licensing', applied[-1])).apps
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:25
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedLicenseActivation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('machine_id', models.CharField(max_length=64)),
+                ('app_version', models.CharField(max_length=20)),
+                ('platform', models.CharField(max_length=20)),
+                ('activated_at', models.DateTimeField()),
+                ('last_validated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('license', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_activations', to='licensing.license')),
+            ],
+            options={
+                'ordering': ['-archived_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+import licensing.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0002_archivedlicenseactivation'),
+    ]
+
+    operations = [
+        # Nullable so a rollback can re-add the text column before refilling it
+        migrations.AlterField(
+            model_name='licenseactivation',
+            name='machine_id',
+            field=models.CharField(help_text='SHA256 hash of hostname (32 chars)', max_length=64, null=True),
+        ),
+        migrations.AlterField(
+            model_name='archivedlicenseactivation',
+            name='machine_id',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='licenseactivation',
+            name='machine_id_bin',
+            field=licensing.fields.HexBinaryField(max_length=32, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedlicenseactivation',
+            name='machine_id_bin',
+            field=licensing.fields.HexBinaryField(max_length=32, null=True),
+        ),
+    ]
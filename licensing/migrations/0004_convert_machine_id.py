@@ -0,0 +1,34 @@
+from django.db import migrations
+
+from licensing.machine_ids import check_machine_ids, copy_machine_ids
+
+MODEL_NAMES = ['LicenseActivation', 'ArchivedLicenseActivation']
+
+
+def text_to_binary(apps, schema_editor):
+    using = schema_editor.connection.alias
+    check_machine_ids(apps, using)
+    for model_name in MODEL_NAMES:
+        model = apps.get_model('licensing', model_name)
+        copy_machine_ids(model, using, 'machine_id', 'machine_id_bin')
+
+
+def binary_to_text(apps, schema_editor):
+    for model_name in MODEL_NAMES:
+        model = apps.get_model('licensing', model_name)
+        copy_machine_ids(model, schema_editor.connection.alias, 'machine_id_bin', 'machine_id')
+
+
+class Migration(migrations.Migration):
+
+    # Each batch commits on its own so large tables aren't locked for the whole copy.
+    # 0005 picks up any rows the running app writes after this pass.
+    atomic = False
+
+    dependencies = [
+        ('licensing', '0003_machine_id_bin'),
+    ]
+
+    operations = [
+        migrations.RunPython(text_to_binary, binary_to_text),
+    ]
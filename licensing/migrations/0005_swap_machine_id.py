@@ -0,0 +1,67 @@
+import licensing.fields
+from django.db import migrations
+
+from licensing.machine_ids import check_machine_ids, copy_machine_ids
+
+MODEL_NAMES = ['LicenseActivation', 'ArchivedLicenseActivation']
+
+
+def catch_up(apps, schema_editor):
+    """Convert rows written by the running app since 0004, then hold writes until commit."""
+    using = schema_editor.connection.alias
+    models = [apps.get_model('licensing', model_name) for model_name in MODEL_NAMES]
+    if schema_editor.connection.vendor == 'postgresql':
+        for model in models:
+            schema_editor.execute(
+                f'LOCK TABLE {schema_editor.quote_name(model._meta.db_table)} IN SHARE ROW EXCLUSIVE MODE'
+            )
+    check_machine_ids(apps, using)
+    for model in models:
+        copy_machine_ids(model, using, 'machine_id', 'machine_id_bin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0004_convert_machine_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(catch_up, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='licenseactivation',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='licenseactivation',
+            name='machine_id',
+        ),
+        migrations.RemoveField(
+            model_name='archivedlicenseactivation',
+            name='machine_id',
+        ),
+        migrations.RenameField(
+            model_name='licenseactivation',
+            old_name='machine_id_bin',
+            new_name='machine_id',
+        ),
+        migrations.RenameField(
+            model_name='archivedlicenseactivation',
+            old_name='machine_id_bin',
+            new_name='machine_id',
+        ),
+        migrations.AlterField(
+            model_name='licenseactivation',
+            name='machine_id',
+            field=licensing.fields.HexBinaryField(help_text='SHA256 hash of hostname (hex, stored as bytes)', max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='archivedlicenseactivation',
+            name='machine_id',
+            field=licensing.fields.HexBinaryField(max_length=32),
+        ),
+        migrations.AlterUniqueTogether(
+            name='licenseactivation',
+            unique_together={('license', 'machine_id')},
+        ),
+    ]
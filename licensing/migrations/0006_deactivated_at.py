@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+def backfill_deactivated_at(apps, schema_editor):
+    # Best available estimate for rows deactivated before the field existed
+    for model_name in ['LicenseActivation', 'ArchivedLicenseActivation']:
+        model = apps.get_model('licensing', model_name)
+        queryset = model.objects.using(schema_editor.connection.alias)
+        if model_name == 'LicenseActivation':
+            queryset = queryset.filter(is_active=False)
+        queryset.filter(deactivated_at__isnull=True).update(
+            deactivated_at=models.F('last_validated_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensing', '0005_swap_machine_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='licenseactivation',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedlicenseactivation',
+            name='deactivated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_deactivated_at, migrations.RunPython.noop),
+    ]
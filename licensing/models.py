@@ -1,5 +1,8 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+
+from .fields import HexBinaryField
 
 
 class License(models.Model):
@@ -37,6 +40,46 @@ class License(models.Model):
         return self.active_activations_count < self.max_activations
 
 
+class LicenseActivationQuerySet(models.QuerySet):
+
+    def archive(self, batch_size=1000):
+        """
+        Move inactive activations in this queryset to the archive table.
+
+        Rows are copied and deleted in batches so the hot table and its
+        indexes only hold the live fleet. Returns the number archived.
+        """
+        archived = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    self.filter(is_active=False)
+                    .select_for_update(skip_locked=True)
+                    .order_by('pk')[:batch_size]
+                )
+                if not batch:
+                    break
+                now = timezone.now()
+                ArchivedLicenseActivation.objects.bulk_create([
+                    ArchivedLicenseActivation(
+                        license_id=activation.license_id,
+                        machine_id=activation.machine_id,
+                        app_version=activation.app_version,
+                        platform=activation.platform,
+                        activated_at=activation.activated_at,
+                        last_validated_at=activation.last_validated_at,
+                        deactivated_at=activation.deactivated_at,
+                        archived_at=now,
+                    )
+                    for activation in batch
+                ])
+                LicenseActivation.objects.filter(
+                    pk__in=[activation.pk for activation in batch]
+                ).delete()
+            archived += len(batch)
+        return archived
+
+
 class LicenseActivation(models.Model):
     """
     Tracks individual machine activations for a license.
@@ -46,22 +89,63 @@ class LicenseActivation(models.Model):
         on_delete=models.CASCADE, 
         related_name='activations'
     )
-    machine_id = models.CharField(max_length=64, help_text="SHA256 hash of hostname (32 chars)")
+    machine_id = HexBinaryField(max_length=32, help_text="SHA256 hash of hostname (hex, stored as bytes)")
     app_version = models.CharField(max_length=20)
     platform = models.CharField(max_length=20, help_text="win32, darwin, or linux")
     
     # Timestamps
     activated_at = models.DateTimeField(auto_now_add=True)
     last_validated_at = models.DateTimeField(auto_now=True)
+    deactivated_at = models.DateTimeField(blank=True, null=True)
     
     # Status
     is_active = models.BooleanField(default=True)
 
+    objects = LicenseActivationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-activated_at']
         # A machine can only have one activation per license
         unique_together = ['license', 'machine_id']
 
+    def save(self, *args, **kwargs):
+        # Keep deactivated_at in step with is_active for every save path,
+        # including the admin forms. Bulk update() callers must set it themselves.
+        if self.is_active:
+            self.deactivated_at = None
+        elif self.deactivated_at is None:
+            self.deactivated_at = timezone.now()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         status = "active" if self.is_active else "inactive"
         return f"{self.license.key} on {self.machine_id[:8]}... ({status})"
+
+
+class ArchivedLicenseActivation(models.Model):
+    """
+    Historical copy of a deactivated machine activation.
+
+    Inactive rows are moved here from LicenseActivation so the hot table
+    stays sized to the live fleet. A machine may appear more than once.
+    """
+    license = models.ForeignKey(
+        License,
+        on_delete=models.CASCADE,
+        related_name='archived_activations'
+    )
+    machine_id = HexBinaryField(max_length=32)
+    app_version = models.CharField(max_length=20)
+    platform = models.CharField(max_length=20)
+
+    # Timestamps (copied from the original activation)
+    activated_at = models.DateTimeField()
+    last_validated_at = models.DateTimeField()
+    deactivated_at = models.DateTimeField(blank=True, null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-archived_at']
+
+    def __str__(self):
+        return f"{self.license.key} on {self.machine_id[:8]}... (archived)"
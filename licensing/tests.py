@@ -0,0 +1,388 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+
+from .fields import HexBinaryField, hex_prefix_range
+from .models import License, LicenseActivation, ArchivedLicenseActivation
+
+MACHINE_ID = 'abcdef0123456789abcdef0123456789'
+
+
+class LicenseAPITestCase(TestCase):
+
+    def setUp(self):
+        self.license = License.objects.create(email='customer@example.com', max_activations=1)
+
+    def post(self, endpoint, **data):
+        payload = {
+            'license_key': str(self.license.key),
+            'machine_id': MACHINE_ID,
+            'app_version': '1.0.0',
+            'platform': 'linux',
+        }
+        payload.update(data)
+        response = self.client.post(
+            f'/api/license/{endpoint}/',
+            json.dumps(payload),
+            content_type='application/json',
+        )
+        return response.json()
+
+
+class ReactivationTests(LicenseAPITestCase):
+
+    def test_reactivate_reuses_inactive_row(self):
+        self.post('activate')
+        self.post('deactivate')
+        activation = LicenseActivation.objects.get()
+        activation.activated_at = timezone.now() - timedelta(days=30)
+        activation.save()
+
+        self.assertTrue(self.post('activate')['success'])
+
+        activation.refresh_from_db()
+        self.assertEqual(LicenseActivation.objects.count(), 1)
+        self.assertTrue(activation.is_active)
+        self.assertIsNone(activation.deactivated_at)
+        self.assertGreater(activation.activated_at, timezone.now() - timedelta(minutes=1))
+        self.assertEqual(self.post('validate'), {'valid': True})
+
+    def test_reactivate_after_archival(self):
+        self.post('activate')
+        self.post('deactivate')
+        LicenseActivation.objects.archive()
+
+        self.assertTrue(self.post('activate')['success'])
+
+        self.assertEqual(LicenseActivation.objects.filter(is_active=True).count(), 1)
+        self.assertEqual(ArchivedLicenseActivation.objects.count(), 1)
+        self.assertEqual(self.post('validate'), {'valid': True})
+
+    def test_reactivate_respects_max_activations(self):
+        self.post('activate')
+        self.post('deactivate')
+        self.post('activate', machine_id='00' * 16)
+
+        result = self.post('activate')
+
+        self.assertEqual(result['error'], 'ALREADY_ACTIVATED')
+
+    def test_deactivate_sets_deactivated_at(self):
+        self.post('activate')
+        self.post('deactivate')
+
+        activation = LicenseActivation.objects.get()
+        self.assertFalse(activation.is_active)
+        self.assertIsNotNone(activation.deactivated_at)
+
+
+class MachineIdValidationTests(LicenseAPITestCase):
+
+    INVALID_MACHINE_IDS = ['my-hostname', 'abc', 'ab' * 33]
+
+    def test_activate_rejects_invalid_machine_id(self):
+        for machine_id in self.INVALID_MACHINE_IDS:
+            with self.subTest(machine_id=machine_id):
+                result = self.post('activate', machine_id=machine_id)
+                self.assertEqual(result['error'], 'INVALID_REQUEST')
+        self.assertFalse(LicenseActivation.objects.exists())
+
+    def test_validate_rejects_invalid_machine_id(self):
+        for machine_id in self.INVALID_MACHINE_IDS:
+            with self.subTest(machine_id=machine_id):
+                result = self.post('validate', machine_id=machine_id)
+                self.assertEqual(result, {'valid': False, 'error': 'INVALID_REQUEST'})
+
+    def test_deactivate_rejects_invalid_machine_id(self):
+        self.post('activate')
+        for machine_id in self.INVALID_MACHINE_IDS:
+            with self.subTest(machine_id=machine_id):
+                result = self.post('deactivate', machine_id=machine_id)
+                self.assertFalse(result['success'])
+        self.assertTrue(LicenseActivation.objects.get().is_active)
+
+    def test_machine_id_is_case_insensitive(self):
+        self.post('activate', machine_id=MACHINE_ID.upper())
+
+        self.assertEqual(LicenseActivation.objects.get().machine_id, MACHINE_ID)
+        self.assertEqual(self.post('validate'), {'valid': True})
+
+
+class HexBinaryFieldTests(TestCase):
+
+    def test_to_python(self):
+        field = HexBinaryField(max_length=32)
+        self.assertEqual(field.to_python('ABCD'), 'abcd')
+        self.assertEqual(field.to_python(b'\xab\xcd'), 'abcd')
+        self.assertEqual(field.to_python(memoryview(b'\xab\xcd')), 'abcd')
+        self.assertIsNone(field.to_python(None))
+
+    def test_to_python_rejects_invalid_hex(self):
+        field = HexBinaryField(max_length=2)
+        for value in ['zz', 'abc', '', 'ab cd', 'abcdef']:
+            with self.subTest(value=value):
+                with self.assertRaises(ValidationError):
+                    field.to_python(value)
+
+    def test_prep_and_db_values(self):
+        field = HexBinaryField(max_length=32)
+        self.assertEqual(field.get_prep_value('ABCD'), b'\xab\xcd')
+        self.assertEqual(field.get_prep_value(b'\xab'), b'\xab')
+        self.assertEqual(field.from_db_value(memoryview(b'\x01\xff'), None, connection), '01ff')
+        self.assertIsNone(field.from_db_value(None, None, connection))
+
+    def test_length_validator_counts_bytes(self):
+        field = HexBinaryField(max_length=2)
+        field.run_validators('abcd')
+        with self.assertRaises(ValidationError):
+            field.run_validators(b'\x00\x00\x00')
+
+    def test_database_round_trip(self):
+        license = License.objects.create(email='customer@example.com')
+        activation = LicenseActivation.objects.create(
+            license=license, machine_id=MACHINE_ID.upper(), app_version='1.0.0', platform='linux'
+        )
+        activation.refresh_from_db()
+
+        self.assertEqual(activation.machine_id, MACHINE_ID)
+        self.assertTrue(LicenseActivation.objects.filter(machine_id=MACHINE_ID.upper()).exists())
+
+    def test_hex_prefix_range(self):
+        self.assertEqual(hex_prefix_range('ab'), (b'\xab', b'\xac'))
+        self.assertEqual(hex_prefix_range('abc'), (b'\xab\xc0', b'\xab\xd0'))
+        self.assertEqual(hex_prefix_range('abff'), (b'\xab\xff', b'\xac'))
+        self.assertEqual(hex_prefix_range('ff'), (b'\xff', None))
+
+
+class ArchiveTests(TestCase):
+
+    def setUp(self):
+        self.license = License.objects.create(email='customer@example.com', max_activations=10)
+
+    def create_activation(self, index, is_active=False, deactivated_at=None):
+        return LicenseActivation.objects.create(
+            license=self.license,
+            machine_id=f'{index:032x}',
+            app_version='1.0.0',
+            platform='linux',
+            is_active=is_active,
+            deactivated_at=deactivated_at,
+        )
+
+    def test_archive_moves_inactive_rows_in_batches(self):
+        for index in range(3):
+            self.create_activation(index)
+        active = self.create_activation(99, is_active=True)
+
+        archived = LicenseActivation.objects.archive(batch_size=2)
+
+        self.assertEqual(archived, 3)
+        self.assertQuerySetEqual(LicenseActivation.objects.all(), [active])
+        self.assertEqual(
+            sorted(ArchivedLicenseActivation.objects.values_list('machine_id', flat=True)),
+            [f'{index:032x}' for index in range(3)],
+        )
+
+    def test_archive_copies_fields(self):
+        deactivated_at = timezone.now() - timedelta(days=3)
+        activation = self.create_activation(1, deactivated_at=deactivated_at)
+
+        LicenseActivation.objects.archive()
+
+        archived = ArchivedLicenseActivation.objects.get()
+        self.assertEqual(archived.license, self.license)
+        self.assertEqual(archived.machine_id, activation.machine_id)
+        self.assertEqual(archived.activated_at, activation.activated_at)
+        self.assertEqual(archived.deactivated_at, deactivated_at)
+
+    def test_command_older_than_days_uses_deactivated_at(self):
+        old = self.create_activation(1, deactivated_at=timezone.now() - timedelta(days=40))
+        self.create_activation(2, deactivated_at=timezone.now() - timedelta(days=1))
+
+        call_command('archive_activations', older_than_days=30, stdout=StringIO())
+
+        self.assertEqual(ArchivedLicenseActivation.objects.get().machine_id, old.machine_id)
+        self.assertEqual(LicenseActivation.objects.count(), 1)
+
+    def test_command_older_than_days_falls_back_to_last_validated_at(self):
+        old = self.create_activation(1)
+        recent = self.create_activation(2)
+        # Simulate rows deactivated by a bulk update that didn't record the time
+        LicenseActivation.objects.update(deactivated_at=None)
+        LicenseActivation.objects.filter(pk=old.pk).update(
+            last_validated_at=timezone.now() - timedelta(days=40)
+        )
+
+        call_command('archive_activations', older_than_days=30, stdout=StringIO())
+
+        self.assertEqual(ArchivedLicenseActivation.objects.get().machine_id, old.machine_id)
+        self.assertQuerySetEqual(LicenseActivation.objects.all(), [recent])
+
+
+class ActivationAdminTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        license = License.objects.create(email='customer@example.com')
+        self.activation = LicenseActivation.objects.create(
+            license=license, machine_id=MACHINE_ID, app_version='1.0.0', platform='linux'
+        )
+
+    def run_action(self, action):
+        return self.client.post('/admin/licensing/licenseactivation/', {
+            'action': action,
+            '_selected_action': [self.activation.pk],
+        })
+
+    def test_deactivate_action_sets_deactivated_at(self):
+        self.run_action('deactivate_activations')
+
+        self.activation.refresh_from_db()
+        self.assertFalse(self.activation.is_active)
+        self.assertIsNotNone(self.activation.deactivated_at)
+
+    def test_reactivate_action_clears_deactivated_at(self):
+        self.run_action('deactivate_activations')
+        self.run_action('reactivate_activations')
+
+        self.activation.refresh_from_db()
+        self.assertTrue(self.activation.is_active)
+        self.assertIsNone(self.activation.deactivated_at)
+
+    def save_change_form(self, is_active):
+        data = {'is_active': 'on'} if is_active else {}
+        return self.client.post(f'/admin/licensing/licenseactivation/{self.activation.pk}/change/', data)
+
+    def save_license_inline(self, is_active):
+        license = self.activation.license
+        data = {
+            'email': license.email,
+            'max_activations': license.max_activations,
+            'expires_at_0': '',
+            'expires_at_1': '',
+            'notes': '',
+            'activations-TOTAL_FORMS': 1,
+            'activations-INITIAL_FORMS': 1,
+            'activations-0-id': self.activation.pk,
+            'activations-0-license': license.pk,
+            'archived_activations-TOTAL_FORMS': 0,
+            'archived_activations-INITIAL_FORMS': 0,
+        }
+        if is_active:
+            data['activations-0-is_active'] = 'on'
+        return self.client.post(f'/admin/licensing/license/{license.pk}/change/', data)
+
+    def test_change_form_keeps_deactivated_at_in_step(self):
+        for save in (self.save_change_form, self.save_license_inline):
+            with self.subTest(save=save.__name__):
+                self.assertEqual(save(is_active=False).status_code, 302)
+                self.activation.refresh_from_db()
+                self.assertFalse(self.activation.is_active)
+                self.assertIsNotNone(self.activation.deactivated_at)
+
+                self.assertEqual(save(is_active=True).status_code, 302)
+                self.activation.refresh_from_db()
+                self.assertTrue(self.activation.is_active)
+                self.assertIsNone(self.activation.deactivated_at)
+
+    def test_change_form_deactivation_is_archived_by_age(self):
+        self.save_change_form(is_active=False)
+        LicenseActivation.objects.filter(pk=self.activation.pk).update(
+            deactivated_at=timezone.now() - timedelta(days=90)
+        )
+
+        call_command('archive_activations', older_than_days=30, stdout=StringIO())
+
+        self.assertFalse(LicenseActivation.objects.exists())
+        self.assertEqual(ArchivedLicenseActivation.objects.count(), 1)
+
+    def test_search_by_displayed_prefix(self):
+        other = LicenseActivation.objects.create(
+            license=self.activation.license, machine_id='ab' * 16, app_version='1.0.0', platform='linux'
+        )
+        url = '/admin/licensing/licenseactivation/'
+        for term, expected in [
+            (f'{MACHINE_ID[:12]}...', [self.activation]),
+            (MACHINE_ID.upper(), [self.activation]),
+            ('abab', [other]),
+            ('abc', [self.activation]),
+            ('zz', []),
+        ]:
+            with self.subTest(term=term):
+                response = self.client.get(url, {'q': term})
+                self.assertEqual(list(response.context['cl'].result_list), expected)
+
+
+class MachineIdMigrationTests(TransactionTestCase):
+
+    def migrate(self, target):
+        executor = MigrationExecutor(connection)
+        executor.migrate([('licensing', target)])
+        executor.loader.build_graph()
+        return executor.loader.project_state(('licensing', target)).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes('licensing'))
+
+    def create_activation(self, apps, machine_id, **kwargs):
+        license_model = apps.get_model('licensing', 'License')
+        license, _ = license_model.objects.get_or_create(email='customer@example.com')
+        return apps.get_model('licensing', 'LicenseActivation').objects.create(
+            license=license,
+            machine_id=machine_id,
+            app_version='1.0.0',
+            platform='linux',
+            **kwargs
+        )
+
+    def test_forward_and_backward(self):
+        apps = self.migrate('0002_archivedlicenseactivation')
+        activation = self.create_activation(apps, MACHINE_ID.upper())
+
+        apps = self.migrate('0005_swap_machine_id')
+        model = apps.get_model('licensing', 'LicenseActivation')
+        self.assertEqual(model.objects.get(pk=activation.pk).machine_id, MACHINE_ID)
+
+        apps = self.migrate('0002_archivedlicenseactivation')
+        model = apps.get_model('licensing', 'LicenseActivation')
+        self.assertEqual(model.objects.get(pk=activation.pk).machine_id, MACHINE_ID)
+
+    def test_catch_up_converts_rows_written_after_copy(self):
+        self.migrate('0002_archivedlicenseactivation')
+        apps = self.migrate('0004_convert_machine_id')
+        activation = self.create_activation(apps, MACHINE_ID)
+
+        apps = self.migrate('0005_swap_machine_id')
+
+        model = apps.get_model('licensing', 'LicenseActivation')
+        self.assertEqual(model.objects.get(pk=activation.pk).machine_id, MACHINE_ID)
+
+    def test_preflight_blocks_unconvertible_rows(self):
+        apps = self.migrate('0002_archivedlicenseactivation')
+        self.create_activation(apps, 'my-hostname')
+        self.create_activation(apps, MACHINE_ID)
+        self.create_activation(apps, MACHINE_ID.upper(), is_active=False)
+
+        with self.assertRaisesMessage(ValueError, "invalid machine_id 'my-hostname'"):
+            self.migrate('0004_convert_machine_id')
+
+        apps = self.migrate('0003_machine_id_bin')
+        model = apps.get_model('licensing', 'LicenseActivation')
+        self.assertFalse(model.objects.filter(machine_id_bin__isnull=False).exists())
+
+        call_command('clean_machine_ids', apply=True, stdout=StringIO())
+        apps = self.migrate('0005_swap_machine_id')
+
+        model = apps.get_model('licensing', 'LicenseActivation')
+        archive_model = apps.get_model('licensing', 'ArchivedLicenseActivation')
+        self.assertEqual(list(model.objects.values_list('machine_id', 'is_active')), [(MACHINE_ID, True)])
+        self.assertEqual(list(archive_model.objects.values_list('machine_id', flat=True)), [MACHINE_ID])
@@ -4,6 +4,7 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.utils import timezone
 
+from .fields import is_hex_digest
 from .models import License, LicenseActivation
 
 
@@ -26,6 +27,11 @@ def validate_uuid(value):
         return False
 
 
+def validate_machine_id(value):
+    """Check if a string is a hex machine ID that fits the stored field."""
+    return is_hex_digest(value, LicenseActivation._meta.get_field('machine_id').max_length)
+
+
 @csrf_exempt
 @require_POST
 def activate_license(request):
@@ -52,6 +58,9 @@ def activate_license(request):
     if not validate_uuid(license_key):
         return json_error('INVALID_KEY', 'License key format is invalid')
     
+    if not validate_machine_id(machine_id):
+        return json_error('INVALID_REQUEST', 'Machine ID format is invalid')
+    
     # Find the license
     try:
         license = License.objects.get(key=license_key)
@@ -66,14 +75,14 @@ def activate_license(request):
     if license.expires_at and license.expires_at < timezone.now():
         return json_error('EXPIRED', 'This license has expired')
     
-    # Check if already activated on this machine
+    # Check if already activated on this machine. An inactive row that has
+    # not been archived yet still holds the (license, machine_id) slot.
     existing_activation = LicenseActivation.objects.filter(
         license=license,
-        machine_id=machine_id,
-        is_active=True
+        machine_id=machine_id
     ).first()
     
-    if existing_activation:
+    if existing_activation and existing_activation.is_active:
         # Re-activation on same machine - update the version/platform
         existing_activation.app_version = app_version
         existing_activation.platform = platform
@@ -90,13 +99,21 @@ def activate_license(request):
             'This license is already activated on another machine'
         )
     
-    # Create new activation
-    LicenseActivation.objects.create(
-        license=license,
-        machine_id=machine_id,
-        app_version=app_version,
-        platform=platform
-    )
+    if existing_activation:
+        # Previously deactivated on this machine - reuse the row
+        existing_activation.app_version = app_version
+        existing_activation.platform = platform
+        existing_activation.is_active = True
+        existing_activation.activated_at = timezone.now()
+        existing_activation.save()
+    else:
+        # Create new activation
+        LicenseActivation.objects.create(
+            license=license,
+            machine_id=machine_id,
+            app_version=app_version,
+            platform=platform
+        )
     
     return JsonResponse({
         'success': True,
@@ -127,6 +144,9 @@ def validate_license(request):
     if not validate_uuid(license_key):
         return JsonResponse({'valid': False, 'error': 'INVALID_KEY'})
     
+    if not validate_machine_id(machine_id):
+        return JsonResponse({'valid': False, 'error': 'INVALID_REQUEST'})
+    
     # Find the license
     try:
         license = License.objects.get(key=license_key)
@@ -184,6 +204,9 @@ def deactivate_license(request):
     if not validate_uuid(license_key):
         return JsonResponse({'success': False, 'message': 'Invalid license key format'})
     
+    if not validate_machine_id(machine_id):
+        return JsonResponse({'success': False, 'message': 'Invalid machine ID format'})
+    
     # Find the license
     try:
         license = License.objects.get(key=license_key)